@@ -1,5 +1,7 @@
-import bpy, os, shutil
-from bpy.props import StringProperty, BoolProperty
+import bpy, gpu, os, pathlib, queue, shutil, struct, subprocess, tempfile, threading
+import numpy as np
+from bpy.props import StringProperty, BoolProperty, IntProperty
+from bpy.app.handlers import persistent
 
 bl_info = {
     "name": "Playblast Quad View",
@@ -27,6 +29,268 @@ class QP_Props(bpy.types.PropertyGroup):
         name="Quad View Active",
         default=False
     )
+    # Cached View3D area/region indices (-1 = unknown), see get_view3d()
+    view3d_area_idx: IntProperty(default=-1, options={'HIDDEN'})
+    view3d_region_idx: IntProperty(default=-1, options={'HIDDEN'})
+
+    @property
+    def resolved(self):
+        """(folder, stem, full path) of render_filepath, with Blender's
+        // prefix expanded. Parses the path in one place instead of each
+        operator repeating the abspath/dirname/splitext chain."""
+        path = pathlib.Path(bpy.path.abspath(self.render_filepath))
+        return str(path.parent), path.stem, str(path)
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+
+# Shared x264 encoder settings for all playblast outputs
+_FFMPEG_ENCODE_ARGS = [
+    '-c:v', 'libx264',
+    '-preset', 'fast',
+    '-crf', '18',
+    '-pix_fmt', 'yuv420p',
+]
+
+
+# Resolved ffmpeg location, looked up lazily on the first playblast
+_ffmpeg_path = None
+
+
+def _ffmpeg_bin():
+    """Locate the ffmpeg executable, preferring one shipped next to the
+    Blender binary, falling back to the system PATH. The result is cached
+    for the session so repeated playblasts skip the filesystem probing;
+    a failed lookup is retried, in case ffmpeg gets installed later."""
+    global _ffmpeg_path
+    if _ffmpeg_path is None:
+        bundled = os.path.join(os.path.dirname(bpy.app.binary_path), 'ffmpeg')
+        for candidate in (bundled, bundled + '.exe'):
+            if os.path.isfile(candidate):
+                _ffmpeg_path = candidate
+                break
+        else:
+            _ffmpeg_path = shutil.which('ffmpeg')
+    return _ffmpeg_path
+
+
+def _open_raw_encoder(ffmpeg, width, height, fps, filepath):
+    """Spawn an ffmpeg process that encodes raw RGBA frames from stdin."""
+    cmd = [
+        ffmpeg, '-y',
+        '-f', 'rawvideo',
+        '-pixel_format', 'rgba',
+        '-video_size', f"{width}x{height}",
+        '-framerate', str(fps),
+        '-i', '-',
+        # OpenGL reads bottom-up, and yuv420p needs even dimensions
+        '-vf', 'vflip,crop=trunc(iw/2)*2:trunc(ih/2)*2',
+    ] + _FFMPEG_ENCODE_ARGS + [filepath]
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+
+def get_view3d(context):
+    """Return the (area, region) pair of the first View3D WINDOW region.
+
+    The indices cached on QP_Props are tried first, so the O(areas x regions)
+    scan only runs when the cache is stale (e.g. after a layout change)."""
+    props = context.scene.qp_props
+    areas = context.screen.areas
+    if 0 <= props.view3d_area_idx < len(areas):
+        area = areas[props.view3d_area_idx]
+        if area.type == 'VIEW_3D' and 0 <= props.view3d_region_idx < len(area.regions):
+            region = area.regions[props.view3d_region_idx]
+            if region.type == 'WINDOW':
+                return area, region
+    a_idx, r_idx = next(
+        ((ai, ri)
+         for ai, a in enumerate(areas) if a.type == 'VIEW_3D'
+         for ri, r in enumerate(a.regions) if r.type == 'WINDOW'),
+        (-1, -1))
+    props.view3d_area_idx = a_idx
+    props.view3d_region_idx = r_idx
+    if a_idx < 0:
+        return None, None
+    return areas[a_idx], areas[a_idx].regions[r_idx]
+
+
+@persistent
+def _reset_view3d_cache(*_args):
+    # Screen layouts come from the loaded file, so cached indices are stale
+    for scene in bpy.data.scenes:
+        props = getattr(scene, 'qp_props', None)
+        if props:
+            props.view3d_area_idx = -1
+            props.view3d_region_idx = -1
+
+
+class _FrameWriter:
+    """Feed raw frames to the ffmpeg encoder from a dedicated thread.
+
+    A single writer keeps the stdin writes in frame order, and the bounded
+    queue gives natural backpressure: when x264 falls behind, put() blocks
+    the capture loop instead of letting frames pile up, capping peak memory
+    at maxsize frames."""
+
+    def __init__(self, proc, maxsize=4):
+        self._proc = proc
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self.error is not None:
+                continue  # keep draining so put() never blocks forever
+            try:
+                self._proc.stdin.write(frame)
+            except OSError as e:
+                self.error = e
+
+    def put(self, frame):
+        self._queue.put(frame)
+
+    def close(self):
+        """Flush pending frames, close the pipe and wait for ffmpeg."""
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            self._proc.stdin.close()
+        except OSError as e:
+            # A dead encoder breaks the pipe on close; still reap it below
+            if self.error is None:
+                self.error = e
+        self._proc.wait()
+        return self._proc.returncode
+
+
+class _UIHider:
+    """Snapshot and hide the View3D panels/gizmos around a capture.
+
+    Probes the attribute list once on hide() and restores the saved values
+    on restore(), so the operators no longer repeat hasattr checks at both
+    ends and the original state survives exception paths."""
+    __slots__ = ('_space', '_saved')
+
+    _ATTRS = ('show_region_ui', 'show_region_toolbar',
+              'show_gizmo', 'show_region_tool_header')
+
+    def __init__(self, space):
+        self._space = space
+        self._saved = None
+
+    def hide(self):
+        self._saved = {k: getattr(self._space, k)
+                       for k in self._ATTRS if hasattr(self._space, k)}
+        for k in self._saved:
+            setattr(self._space, k, False)
+
+    def restore(self):
+        if self._saved:
+            for k, v in self._saved.items():
+                setattr(self._space, k, v)
+            self._saved = None
+
+    def __enter__(self):
+        self.hide()
+        return self
+
+    def __exit__(self, *_exc):
+        self.restore()
+
+
+def _png_size(path):
+    """Read (width, height) straight from the PNG IHDR header, which sits at
+    a fixed offset, instead of decoding the whole image."""
+    with open(path, 'rb') as f:
+        f.seek(16)
+        return struct.unpack('>II', f.read(8))
+
+
+class _RegionCapture:
+    """Capture the View3D WINDOW region(s) of an area without going
+    through disk.
+
+    Viewport dimensions do not change during a playblast, so the GL
+    texture/FBO pair behind each sub-view size is allocated once and
+    reused for every frame; free() releases them when the loop ends."""
+    __slots__ = ('_space', '_windows', '_offscreens', '_buffers', '_frame')
+
+    def __init__(self, space, area):
+        self._space = space
+        self._windows = [r for r in area.regions if r.type == 'WINDOW']
+        self._offscreens = {}
+        self._buffers = {}
+        self._frame = None
+
+    def _draw_view(self, context, region, rv3d, width, height):
+        """Draw one 3D view into its persistent offscreen buffer and return
+        the pixels as a (height, width, 4) uint8 array (bottom-up, as
+        OpenGL returns them)."""
+        key = (width, height)
+        offscreen = self._offscreens.get(key)
+        if offscreen is None:
+            offscreen = gpu.types.GPUOffScreen(width, height)
+            self._offscreens[key] = offscreen
+        # Read back into a preallocated buffer: only its contents change
+        # from frame to frame, not the allocation
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = gpu.types.Buffer('UBYTE', width * height * 4)
+            self._buffers[key] = buf
+        offscreen.draw_view3d(
+            context.scene,
+            context.view_layer,
+            self._space,
+            region,
+            rv3d.view_matrix,
+            rv3d.window_matrix,
+            # Apply the display transform so the video matches the viewport
+            do_color_management=True,
+        )
+        with offscreen.bind():
+            fb = gpu.state.active_framebuffer_get()
+            fb.read_color(0, 0, width, height, 4, 0, 'UBYTE', data=buf)
+        return np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 4)
+
+    def capture(self, context):
+        """Capture the area's full viewport. In Quad View the WINDOW
+        region is split into four quarter-size QSPLIT WINDOW regions, each
+        carrying its own RegionView3D as region.data; every one is drawn
+        at its on-screen size and composited by its offset in the area."""
+        windows = self._windows
+        if len(windows) == 1:
+            region = windows[0]
+            return self._draw_view(context, region, region.data,
+                                   region.width, region.height)
+
+        x_min = min(r.x for r in windows)
+        y_min = min(r.y for r in windows)
+        total_w = max(r.x + r.width for r in windows) - x_min
+        total_h = max(r.y + r.height for r in windows) - y_min
+        if self._frame is None:
+            self._frame = np.zeros((total_h, total_w, 4), dtype=np.uint8)
+        frame = self._frame
+        for region in windows:
+            pixels = self._draw_view(context, region, region.data,
+                                     region.width, region.height)
+            x0 = region.x - x_min
+            y0 = region.y - y_min
+            frame[y0:y0 + region.height, x0:x0 + region.width] = pixels
+        return frame
+
+    def free(self):
+        for offscreen in self._offscreens.values():
+            offscreen.free()
+        self._offscreens.clear()
+        self._buffers.clear()
+        self._frame = None
+
 
 # ------------------------------------------------------------------------
 # Operators
@@ -41,17 +305,7 @@ class QP_OT_switch_layout(bpy.types.Operator):
 
     def execute(self, context):
         props = context.scene.qp_props
-        view3d_area = None
-        view3d_region = None
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                for region in area.regions:
-                    if region.type == 'WINDOW':
-                        view3d_area = area
-                        view3d_region = region
-                        break
-                if view3d_area:
-                    break
+        view3d_area, view3d_region = get_view3d(context)
 
         if not view3d_area or not view3d_region:
             self.report({'ERROR'}, "Could not find a View3D area with a WINDOW region.")
@@ -79,7 +333,7 @@ class QP_OT_open_render_folder(bpy.types.Operator):
     bl_label = "Open Saved Folder"
 
     def execute(self, context):
-        folder_path = bpy.path.abspath(os.path.dirname(context.scene.qp_props.render_filepath))
+        folder_path = context.scene.qp_props.resolved[0]
         if os.path.exists(folder_path):
             import platform
             import subprocess
@@ -105,65 +359,56 @@ class QP_OT_screenshot_quadview(bpy.types.Operator):
     _timer = None
     _view3d_area = None
     _region_window = None
-    _ui_was_visible = False
-    _toolbar_was_visible = False
+    _ui_hider = None
     _file_path = ""
+    _draw_handler = None
+    _redrawn = False
 
     def execute(self, context):
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                self._view3d_area = area
-                break
+        self._view3d_area, self._region_window = get_view3d(context)
         if not self._view3d_area:
-            self.report({'ERROR'}, "VIEW_3D not found")
+            self.report({'ERROR'}, "Could not find a View3D area with a WINDOW region.")
             return {'CANCELLED'}
 
-        self._region_window = next((r for r in self._view3d_area.regions if r.type == 'WINDOW'), None)
-        if not self._region_window:
-            self.report({'ERROR'}, "WINDOW region not found")
-            return {'CANCELLED'}
-        
-        user_filepath = bpy.path.abspath(context.scene.qp_props.render_filepath)
-        folder_path = os.path.dirname(user_filepath)
-        filename = os.path.splitext(os.path.basename(user_filepath))[0] + ".png"
-        self._file_path = os.path.join(folder_path, filename)
+        folder_path, stem, _ = context.scene.qp_props.resolved
+        self._file_path = os.path.join(folder_path, stem + ".png")
         os.makedirs(folder_path, exist_ok=True)
-        
-        space = self._view3d_area.spaces.active
-        self._ui_was_visible = space.show_region_ui
-        self._toolbar_was_visible = space.show_region_toolbar
-        space.show_region_ui = False
-        space.show_region_toolbar = False
-        
-        if hasattr(context.space_data, 'show_gizmo'):
-            context.space_data.show_gizmo = False
-        if hasattr(context.space_data, 'show_region_tool_header'):
-            context.space_data.show_region_tool_header = False
+
+        self._ui_hider = _UIHider(self._view3d_area.spaces.active)
+        self._ui_hider.hide()
 
         bpy.context.view_layer.update()
 
+        # Snap as soon as the viewport has actually redrawn with the UI
+        # hidden, instead of waiting a fixed 200 ms
+        self._redrawn = False
+        self._draw_handler = bpy.types.SpaceView3D.draw_handler_add(
+            self._on_draw, (), 'WINDOW', 'POST_PIXEL')
+        self._view3d_area.tag_redraw()
+
         wm = context.window_manager
-        self._timer = wm.event_timer_add(0.2, window=context.window)
+        self._timer = wm.event_timer_add(0.0, window=context.window)
         wm.modal_handler_add(self)
 
         return {'RUNNING_MODAL'}
 
+    def _on_draw(self):
+        # The handler fires for every View3D; only a redraw of the target
+        # area proves its panels are hidden on screen
+        if bpy.context.area == self._view3d_area:
+            self._redrawn = True
+
     def modal(self, context, event):
-        if event.type == 'TIMER':
+        if event.type == 'TIMER' and self._redrawn:
             wm = context.window_manager
             wm.event_timer_remove(self._timer)
+            bpy.types.SpaceView3D.draw_handler_remove(self._draw_handler, 'WINDOW')
+            self._draw_handler = None
 
             with context.temp_override(area=self._view3d_area, region=self._region_window):
                 bpy.ops.screen.screenshot_area(filepath=self._file_path)
 
-            space = self._view3d_area.spaces.active
-            space.show_region_ui = self._ui_was_visible
-            space.show_region_toolbar = self._toolbar_was_visible
-            
-            if hasattr(context.space_data, 'show_gizmo'):
-                context.space_data.show_gizmo = True
-            if hasattr(context.space_data, 'show_region_tool_header'):
-                context.space_data.show_region_tool_header = True
+            self._ui_hider.restore()
 
             bpy.context.view_layer.update()
 
@@ -184,24 +429,19 @@ class QP_OT_screenshot_quadview_anim(bpy.types.Operator):
     _frame_current = 0
     _frame_start = 0
     _frame_end = 0
+    _last_applied_frame = -1
     _folder_path = ""
-    _ui_was_visible = False
-    _toolbar_was_visible = False
+    _ui_hider = None
+    _capture = None
     _timer = None
     _wait_frames = 2
+    _saved_file_format = 'PNG'
+    _saved_compression = 15
 
     def execute(self, context):
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                self._view3d_area = area
-                break
+        self._view3d_area, self._region_window = get_view3d(context)
         if not self._view3d_area:
-            self.report({'ERROR'}, "VIEW_3D not found")
-            return {'CANCELLED'}
-
-        self._region_window = next((r for r in self._view3d_area.regions if r.type == 'WINDOW'), None)
-        if not self._region_window:
-            self.report({'ERROR'}, "WINDOW region not found")
+            self.report({'ERROR'}, "Could not find a View3D area with a WINDOW region.")
             return {'CANCELLED'}
 
         scene = context.scene
@@ -209,30 +449,55 @@ class QP_OT_screenshot_quadview_anim(bpy.types.Operator):
         self._frame_start = scene.frame_start
         self._frame_end = scene.frame_end
         self._frame_current = self._frame_start
+        self._last_applied_frame = -1
 
-        # Create temp folder
-        user_filepath = bpy.path.abspath(scene.qp_props.render_filepath)
-        folder_main = os.path.dirname(user_filepath)
-
-        filename_base = os.path.splitext(os.path.basename(user_filepath))[0]
+        # Prefer capturing pixels straight from the GPU; fall back to the
+        # slower screenshot-to-disk path when no offscreen buffer can be made
+        self._use_offscreen = True
+        self._capture = None
+        try:
+            gpu.types.GPUOffScreen(8, 8).free()
+        except Exception:
+            self._use_offscreen = False
+
+        if self._use_offscreen:
+            self._capture = _RegionCapture(
+                self._view3d_area.spaces.active, self._view3d_area)
+
+        self._writer = None
+        if self._use_offscreen:
+            self._ffmpeg = _ffmpeg_bin()
+            if not self._ffmpeg:
+                self.report({'ERROR'}, "ffmpeg executable not found.")
+                return {'CANCELLED'}
+
+        folder_main, filename_base, user_filepath = scene.qp_props.resolved
         self._folder_path = os.path.join(folder_main, f"{filename_base}_temp")
-        os.makedirs(self._folder_path, exist_ok=True)
-
-        space = self._view3d_area.spaces.active
-        self._ui_was_visible = space.show_region_ui
-        self._toolbar_was_visible = space.show_region_toolbar
-        space.show_region_ui = False
-        space.show_region_toolbar = False
-        
-        if hasattr(context.space_data, 'show_gizmo'):
-            context.space_data.show_gizmo = False
-        if hasattr(context.space_data, 'show_region_tool_header'):
-            context.space_data.show_region_tool_header = False
+        self._output_path = user_filepath
+        # ffmpeg does not create the output folder itself
+        os.makedirs(folder_main, exist_ok=True)
+        if not self._use_offscreen:
+            # Temp folder for the screenshot-to-disk fallback
+            os.makedirs(self._folder_path, exist_ok=True)
+            # Join the folder once; the loop only formats the frame number
+            self._path_prefix = os.path.join(self._folder_path, "quadview_frame_")
+            # Temp frames are deleted right after encoding, so skip PNG
+            # compression: screenshot_area writes (and ffmpeg re-reads) faster
+            settings = scene.render.image_settings
+            self._saved_file_format = settings.file_format
+            self._saved_compression = settings.compression
+            settings.file_format = 'PNG'
+            settings.compression = 0
+
+        self._ui_hider = _UIHider(self._view3d_area.spaces.active)
+        self._ui_hider.hide()
 
         bpy.context.view_layer.update()
 
+        # Zero interval: the timer fires every event-loop iteration, so
+        # throughput is bound by capture time instead of a wallclock quantum
         context.window_manager.modal_handler_add(self)
-        self._timer = context.window_manager.event_timer_add(0.05, window=context.window)
+        self._timer = context.window_manager.event_timer_add(0.0, window=context.window)
 
         self._wait_frames = 2
 
@@ -246,35 +511,70 @@ class QP_OT_screenshot_quadview_anim(bpy.types.Operator):
 
             scene = context.scene
             if self._frame_current > self._frame_end:
-                space = self._view3d_area.spaces.active
-                space.show_region_ui = self._ui_was_visible
-                space.show_region_toolbar = self._toolbar_was_visible
-                
-                if hasattr(context.space_data, 'show_gizmo'):
-                    context.space_data.show_gizmo = True
-                if hasattr(context.space_data, 'show_region_tool_header'):
-                    context.space_data.show_region_tool_header = True
-                    
+                self._ui_hider.restore()
+
                 bpy.context.view_layer.update()
                 context.window_manager.event_timer_remove(self._timer)
+
+                if not self._use_offscreen:
+                    settings = scene.render.image_settings
+                    settings.file_format = self._saved_file_format
+                    settings.compression = self._saved_compression
+
                 self.report({'INFO'}, f"Finished video with {self._frame_end - self._frame_start + 1} frames.")
-                
+
+                if self._use_offscreen:
+                    self._capture.free()
+                    return self._finish_stream()
+
                 bpy.ops.qp.combine_images_to_video()
-                
+
                 return {'FINISHED'}
                 
-            scene.frame_set(self._frame_current)
-            bpy.context.view_layer.update()
-
-            filename = os.path.join(self._folder_path, f"quadview_frame_{self._frame_current:04d}.png")
+            # frame_set already evaluates the depsgraph, no extra update
+            # needed -- and skip it entirely when the frame did not change
+            if self._frame_current != self._last_applied_frame:
+                scene.frame_set(self._frame_current)
+                self._last_applied_frame = self._frame_current
+
+            if self._use_offscreen:
+                frame = self._capture.capture(context)
+                if self._writer is None:
+                    self._writer = _FrameWriter(_open_raw_encoder(
+                        self._ffmpeg, frame.shape[1], frame.shape[0],
+                        scene.render.fps, self._output_path))
+                # Encode on the writer thread while the next frame renders
+                self._writer.put(frame.tobytes())
+            else:
+                filename = f"{self._path_prefix}{self._frame_current:04d}.png"
 
-            with context.temp_override(area=self._view3d_area, region=self._region_window):
-                bpy.ops.screen.screenshot_area(filepath=filename)
+                with context.temp_override(area=self._view3d_area, region=self._region_window):
+                    bpy.ops.screen.screenshot_area(filepath=filename)
 
             self._frame_current += 1
 
         return {'RUNNING_MODAL'}
 
+    def _finish_stream(self):
+        """Flush the writer thread and close the ffmpeg encoder."""
+        if self._writer is None:
+            self.report({'ERROR'}, "No frames were captured.")
+            return {'CANCELLED'}
+        try:
+            returncode = self._writer.close()
+        except OSError as e:
+            self.report({'ERROR'}, f"Error creating video: {e}")
+            return {'CANCELLED'}
+        if self._writer.error is not None:
+            self.report({'ERROR'}, f"Error creating video: {self._writer.error}")
+            return {'CANCELLED'}
+        if returncode != 0:
+            self.report({'ERROR'}, f"ffmpeg exited with code {returncode}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Video completed: {self._output_path}")
+        return {'FINISHED'}
+
 # Operator to combine image sequences into a video
 class QP_OT_combine_images_to_video(bpy.types.Operator):
     """Combine image sequence into an MP4 video and delete the image folder"""
@@ -285,24 +585,34 @@ class QP_OT_combine_images_to_video(bpy.types.Operator):
         scene = context.scene
         props = scene.qp_props
         
-        user_filepath = bpy.path.abspath(props.render_filepath)
-        folder_main = os.path.dirname(user_filepath)
-        filename_base = os.path.splitext(os.path.basename(user_filepath))[0]
+        folder_main, filename_base, user_filepath = props.resolved
         folder_temp = os.path.join(folder_main, f"{filename_base}_temp")
 
         if not os.path.exists(folder_temp):
             self.report({'ERROR'}, "Temporary image folder does not exist.")
             return {'CANCELLED'}
 
-        images = sorted([f for f in os.listdir(folder_temp) if f.endswith('.png')])
-        if not images:
+        # Only pick up our own frames: the operator can be invoked on any
+        # folder, so a stray PNG must not leak into the video
+        prefix = "quadview_frame_"
+        with os.scandir(folder_temp) as it:
+            names = [e.name for e in it
+                     if e.is_file(follow_symlinks=False)
+                     and e.name.startswith(prefix) and e.name.endswith('.png')]
+        if not names:
             self.report({'ERROR'}, "No images found to combine into a video.")
             return {'CANCELLED'}
 
-        first_image_path = os.path.join(folder_temp, images[0])
-        img_data = bpy.data.images.load(first_image_path)
-        img_width, img_height = img_data.size
-        bpy.data.images.remove(img_data)
+        try:
+            start_number = min(int(n[len(prefix):-4]) for n in names)
+        except ValueError:
+            self.report({'ERROR'},
+                        f"Unexpected frame name in {folder_temp}, "
+                        f"expected {prefix}<number>.png")
+            return {'CANCELLED'}
+
+        first_image_path = os.path.join(folder_temp, f"{prefix}{start_number:04d}.png")
+        img_width, img_height = _png_size(first_image_path)
         
         # Round if width or height is odd
         if img_width % 2 != 0:
@@ -310,67 +620,43 @@ class QP_OT_combine_images_to_video(bpy.types.Operator):
         if img_height % 2 != 0:
             img_height += 1
 
-        video_scene_name = "CombineVideoScene"
-        if video_scene_name in bpy.data.scenes:
-            bpy.data.scenes.remove(bpy.data.scenes[video_scene_name])
-        video_scene = bpy.data.scenes.new(video_scene_name)
-
-        video_scene.render.resolution_x = img_width
-        video_scene.render.resolution_y = img_height
-        video_scene.render.fps = scene.render.fps
-        video_scene.render.image_settings.file_format = 'FFMPEG'
-        video_scene.render.ffmpeg.format = 'MPEG4'
-        video_scene.render.ffmpeg.codec = 'H264'
-        video_scene.render.ffmpeg.constant_rate_factor = 'HIGH'
-        video_scene.render.ffmpeg.ffmpeg_preset = 'GOOD'
-
-        video_scene.frame_start = 1
-        video_scene.frame_end = len(images)
-
-        if not video_scene.sequence_editor:
-            video_scene.sequence_editor_create()
-        seq_editor = video_scene.sequence_editor
-
-        for s in seq_editor.sequences_all:
-            seq_editor.sequences.remove(s)
+        ffmpeg = _ffmpeg_bin()
+        if not ffmpeg:
+            self.report({'ERROR'}, "ffmpeg executable not found.")
+            return {'CANCELLED'}
 
-        # Use the user-defined filepath
-        video_scene.render.filepath = user_filepath
+        cmd = [
+            ffmpeg, '-y',
+            '-framerate', str(scene.render.fps),
+            '-start_number', str(start_number),
+            '-i', os.path.join(folder_temp, 'quadview_frame_%04d.png'),
+            # yuv420p needs even dimensions
+            '-vf', f"pad={img_width}:{img_height}",
+        ] + _FFMPEG_ENCODE_ARGS + [user_filepath]
 
         try:
-            original_scene = context.window.scene
-            context.window.scene = video_scene
-
-            image_strip = seq_editor.sequences.new_image(
-                name="QuadViewImages",
-                filepath=first_image_path,
-                channel=1,
-                frame_start=1
-            )
-
-            for img in images[1:]:
-                image_strip.elements.append(img)
-
-            image_strip.frame_final_duration = len(images)
-
-            bpy.ops.render.render(animation=True, use_viewport=True)
-
-            context.window.scene = original_scene
-
-        except Exception as e:
+            result = subprocess.run(cmd)
+        except OSError as e:
             self.report({'ERROR'}, f"Error creating video: {e}")
-            if video_scene_name in bpy.data.scenes:
-                bpy.data.scenes.remove(bpy.data.scenes[video_scene_name])
+            return {'CANCELLED'}
+        if result.returncode != 0:
+            self.report({'ERROR'}, f"ffmpeg exited with code {result.returncode}")
             return {'CANCELLED'}
 
+        # Rename first so the folder disappears for the user at once, then
+        # unlink the frames in the background; nothing downstream needs them.
+        # mkdtemp keeps the trash name unique, so leftovers of an earlier
+        # cleanup (locked file, AV scan) can never block the rename
         try:
-            shutil.rmtree(folder_temp)
-            self.report({'INFO'}, "Temporary image folder deleted")
-        except Exception as e:
+            trash = tempfile.mkdtemp(prefix=f"{filename_base}_trash_",
+                                     dir=folder_main)
+            os.rename(folder_temp, os.path.join(trash, "frames"))
+        except OSError as e:
             self.report({'WARNING'}, f"Could not delete temp folder: {e}")
-
-        if video_scene_name in bpy.data.scenes:
-            bpy.data.scenes.remove(bpy.data.scenes[video_scene_name])
+        else:
+            threading.Thread(target=shutil.rmtree, args=(trash,),
+                             kwargs={'ignore_errors': True}, daemon=True).start()
+            self.report({'INFO'}, "Temporary image folder deleted")
 
         self.report({'INFO'}, f"Video completed: {user_filepath}")
         return {'FINISHED'}
@@ -445,9 +731,12 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.qp_props = bpy.props.PointerProperty(type=QP_Props)
+    bpy.app.handlers.load_post.append(_reset_view3d_cache)
 
 # Unregister the add-on
 def unregister():
+    if _reset_view3d_cache in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_reset_view3d_cache)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.qp_props